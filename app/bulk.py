@@ -0,0 +1,68 @@
+from typing import Union
+
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from config import Config
+from pipeline import TranslationPipeline, join_segment
+
+
+def read_text_files(paths: list[str]) -> str:
+    """Читает текстовые файлы (UTF-8) и объединяет их содержимое через пустую строку."""
+    parts = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            parts.append(f.read())
+    return "\n\n".join(parts)
+
+
+class BulkTranslationWorker(QObject):
+    """Класс для пофрагментного перевода большого текста через конвейер в фоновом потоке.
+
+    Источник — сам текст или список путей к файлам; файлы читаются в фоновом
+    потоке, чтобы чтение больших файлов не блокировало интерфейс.
+    """
+
+    text_loaded = pyqtSignal(str, int)
+    load_failed = pyqtSignal(str)
+    chunk_translated = pyqtSignal(str)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, source: Union[str, list[str]], pipeline: TranslationPipeline) -> None:
+        """Инициализирует обработчик текста или файлов и конвейер перевода фрагментов."""
+        super().__init__()
+        self.source = source
+        self.pipeline = pipeline
+
+    @pyqtSlot()
+    def run(self) -> None:
+        """Переводит текст по фрагментам, сообщая о прогрессе после каждого из них."""
+        try:
+            text = self.source if isinstance(self.source, str) else read_text_files(self.source)
+        except OSError as e:
+            self.load_failed.emit(f"Не удалось прочитать файл: {e.strerror or e}")
+            self.finished.emit()
+            return
+        # Отдаём интерфейсу только начало текста для предпросмотра
+        self.text_loaded.emit(text[:Config.BULK_PREVIEW_SIZE], len(text))
+
+        total = len(text)
+        done = 0
+
+        def on_result(chunk: str, translated: str) -> None:
+            nonlocal done
+            done += len(chunk)
+            # Сохраняем переводы строк на границах фрагментов
+            self.chunk_translated.emit(join_segment(chunk, translated))
+            self.progress.emit(done, total)
+
+        try:
+            self.pipeline.run(text, on_result)
+        except Exception as e:
+            self.failed.emit(str(e))
+        self.finished.emit()
+
+    def cancel(self) -> None:
+        """Запрашивает остановку перевода после фрагментов, которые уже обрабатываются."""
+        self.pipeline.cancel()
@@ -0,0 +1,54 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from config import Config
+
+
+class TranslationCache:
+    """Класс LRU-кэша переводов, разделённого по версиям модели.
+
+    Записи каждой версии хранятся в отдельном словаре "текст -> перевод", поэтому
+    на запись не создаётся кортеж-ключ с версией, а сброс версии занимает O(1).
+    """
+
+    def __init__(self, max_size: int = Config.CACHE_SIZE) -> None:
+        """Инициализирует пустой кэш с ограничением на число записей одной версии."""
+        self.max_size = max_size
+        self._versions = {}
+        # Выгруженные версии: их переводы, завершившиеся после сброса, не сохраняются
+        self._retired = set()
+        self._lock = threading.Lock()
+
+    def get(self, version: str, text: str) -> Optional[str]:
+        """Возвращает перевод из кэша для указанной версии модели."""
+        with self._lock:
+            entries = self._versions.get(version)
+            if entries is None:
+                return None
+            translated = entries.get(text)
+            if translated is not None:
+                entries.move_to_end(text)
+            return translated
+
+    def put(self, version: str, text: str, translated: str) -> None:
+        """Сохраняет перевод в кэш, вытесняя самые старые записи версии."""
+        with self._lock:
+            if version in self._retired:
+                return
+            entries = self._versions.get(version)
+            if entries is None:
+                entries = self._versions[version] = OrderedDict()
+            entries[text] = translated
+            entries.move_to_end(text)
+            while len(entries) > self.max_size:
+                entries.popitem(last=False)
+
+    def invalidate(self, version: str) -> None:
+        """Удаляет из кэша все записи указанной версии модели и запрещает новые."""
+        with self._lock:
+            self._retired.add(version)
+            self._versions.pop(version, None)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._versions.values())
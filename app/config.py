@@ -12,6 +12,40 @@ class Config:
     # Пути к ресурсам
     ASSETS_PATH = os.path.join(os.path.dirname(__file__), "assets")
     STYLESHEET_PATH = os.path.join(os.path.dirname(__file__), "styles.qss")
+    MODELS_PATH = os.path.join(os.path.dirname(__file__), "models")
+
+    # Параметры модели перевода
+    MAX_LENGTH = 128
+    NUM_BEAMS = 5
+    STUDENT_NUM_BEAMS = 1
+    # Ограничение кэша переводов на каждую версию модели (не на весь кэш): одновременно
+    # активны не больше двух моделей, а записи выгруженных версий сразу удаляются
+    CACHE_SIZE = 1000
+    MODEL_SCAN_DELAY_MS = 2000
+    # Модель загружается, только когда в папке есть все эти файлы и один из файлов весов
+    MODEL_REQUIRED_FILES = ("config.json", "source.spm", "target.spm", "vocab.json")
+    MODEL_WEIGHT_FILES = ("model.safetensors", "pytorch_model.bin")
+    WARMUP_PHRASES = ["Где большой дом?", "Кто видит реку?"]
+    # Роль модели для каждого режима: ученик для интерактивного ввода, учитель для больших текстов
+    MODEL_ROUTES = {"interactive": "student", "bulk": "teacher"}
+
+    # Параметры массового перевода больших текстов (в символах)
+    BULK_INPUT_THRESHOLD = 20000
+    BULK_CHUNK_SIZE = 2000
+    BULK_PREVIEW_SIZE = 2000
+    # Модель обрезает вход до MAX_LENGTH токенов, поэтому получает отдельные предложения;
+    # предложения длиннее MODEL_SEGMENT_SIZE символов режутся по пробелам
+    MODEL_SEGMENT_SIZE = 300
+    # Число фрагментов больших текстов в отдельном кэше (на версию модели)
+    BULK_CACHE_SIZE = 200
+    # Размер пакета и длина очередей между стадиями конвейера перевода
+    PIPELINE_BATCH_SIZE = 8
+    PIPELINE_QUEUE_SIZE = 2
+
+    # Коды языков (хранятся в истории вместо названий) и число записей истории
+    LANG_CODES = {"Русский": "ru", "Алеутский": "ale"}
+    LANG_NAMES = {code: name for name, code in LANG_CODES.items()}
+    HISTORY_LIMIT = 10
 
     # Размеры элементов интерфейса
     BUTTON_SIZE = QSize(30, 30)
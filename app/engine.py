@@ -0,0 +1,106 @@
+import gc
+import os
+import sys
+
+
+def postprocess_translation(text: str) -> str:
+    """Исправляет пробелы перед спецсимволом "ẍ" в переведённом тексте."""
+    return text.replace(" ẍ", "ẍ")
+
+
+def model_version(model_dir: str) -> str:
+    """Возвращает версию модели: имя папки и время последнего изменения её файлов.
+
+    Учитываются все файлы папки, поэтому перезапись весов на месте даёт новую версию.
+    """
+    mtime = max(entry.stat().st_mtime for entry in os.scandir(model_dir) if entry.is_file())
+    return f"{os.path.basename(os.path.normpath(model_dir))}@{int(mtime)}"
+
+
+class MarianEngine:
+    """Класс-обёртка над обученной моделью MarianMT для пакетного перевода."""
+
+    def __init__(
+        self,
+        model_dir: str,
+        version: str,
+        num_beams: int = 5,
+        max_length: int = 128,
+        quantize: bool = False,
+    ) -> None:
+        """Загружает модель и токенизатор из папки с сохранённой моделью.
+
+        Args:
+            model_dir: Путь к папке с моделью и токенизатором.
+            version: Идентификатор версии модели.
+            num_beams: Ширина лучевого поиска (1 — жадное декодирование).
+            max_length: Максимальная длина входа и перевода в токенах.
+            quantize: Применить динамическое квантование линейных слоёв (только CPU).
+        """
+        # Импортируем тяжёлые зависимости только при загрузке модели
+        import torch
+        from transformers import MarianMTModel, MarianTokenizer
+
+        self.torch = torch
+        self.model_dir = model_dir
+        self.version = version
+        self.num_beams = num_beams
+        self.max_length = max_length
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.tokenizer = MarianTokenizer.from_pretrained(model_dir)
+        self.model = MarianMTModel.from_pretrained(model_dir)
+        if quantize:
+            # Квантованные слои int8 поддерживаются только на CPU
+            self.device = torch.device("cpu")
+            self.model = torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        self.model.to(self.device)
+        self.model.eval()
+
+    def tokenize(self, texts: list[str]):
+        """Токенизирует пакет текстов и переносит его на устройство модели."""
+        return self.tokenizer(
+            texts,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+        ).to(self.device)
+
+    def generate(self, inputs):
+        """Генерирует токены перевода для токенизированного пакета."""
+        with self.torch.no_grad():
+            return self.model.generate(
+                **inputs,
+                max_length=self.max_length,
+                num_beams=self.num_beams,
+                early_stopping=self.num_beams > 1,
+            )
+
+    def decode(self, translated_tokens) -> list[str]:
+        """Декодирует токены перевода в строки с постобработкой."""
+        results = self.tokenizer.batch_decode(translated_tokens, skip_special_tokens=True)
+        return [postprocess_translation(result) for result in results]
+
+    def translate_batch(self, texts: list[str]) -> list[str]:
+        """Переводит список текстов за один вызов модели."""
+        return self.decode(self.generate(self.tokenize(texts)))
+
+    def warm_up(self, phrases: list[str]) -> None:
+        """Прогревает модель на тестовых фразах и проверяет результат."""
+        results = self.translate_batch(phrases)
+        if len(results) != len(phrases) or not all(results):
+            raise RuntimeError(f"Модель {self.version} вернула пустой перевод при прогреве")
+
+
+def release_memory() -> None:
+    """Освобождает память модели, на которую больше нет ссылок.
+
+    Веса выгруженной версии освобождаются, когда завершается последний
+    использующий её перевод, поэтому замена модели не прерывает текущие задачи.
+    """
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
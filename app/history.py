@@ -0,0 +1,88 @@
+import sys
+from array import array
+from typing import Iterator, NamedTuple, Optional
+
+from config import Config
+
+
+class HistoryRecord(NamedTuple):
+    """Запись истории переводов с кодами языков вместо их названий."""
+
+    source_lang: str
+    input_text: str
+    target_lang: str
+    translated_text: str
+
+    @classmethod
+    def create(cls, source_name: str, input_text: str, target_name: str, translated_text: str):
+        """Создаёт запись по названиям языков, как они показаны на метках."""
+        return cls(
+            sys.intern(Config.LANG_CODES[source_name]),
+            input_text,
+            sys.intern(Config.LANG_CODES[target_name]),
+            translated_text,
+        )
+
+
+class HistoryLog:
+    """Класс компактного хранилища истории переводов в виде столбцов.
+
+    Тексты всех записей хранятся в одном буфере UTF-8, а записи — как смещения
+    в этом буфере и номера языков, поэтому на запись не создаётся ни словаря,
+    ни отдельных объектов строк. Записи собираются в HistoryRecord при чтении.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        """Инициализирует пустую историю; max_entries ограничивает число записей."""
+        self.max_entries = max_entries
+        self._languages = tuple(sys.intern(code) for code in Config.LANG_CODES.values())
+        self._language_ids = {code: i for i, code in enumerate(self._languages)}
+        self._buffer = bytearray()
+        # Границы текстов: запись i — buffer[offsets[2i]:offsets[2i+1]] и buffer[offsets[2i+1]:offsets[2i+2]]
+        self._offsets = array("Q", [0])
+        self._lang_ids = array("B")
+        self._start = 0
+
+    def append(self, record: HistoryRecord) -> None:
+        """Добавляет запись, вытесняя самую старую при превышении ограничения."""
+        for text in (record.input_text, record.translated_text):
+            self._buffer += text.encode("utf-8")
+            self._offsets.append(len(self._buffer))
+        self._lang_ids.append(self._language_ids[record.source_lang])
+        self._lang_ids.append(self._language_ids[record.target_lang])
+
+        if self.max_entries is not None and len(self) > self.max_entries:
+            self._start += 1
+            # Освобождаем место вытесненных записей, когда их набирается больше половины
+            total = len(self._lang_ids) // 2
+            if self._start * 2 > total:
+                self._compact()
+
+    def _compact(self) -> None:
+        """Удаляет из буферов вытесненные записи."""
+        base = self._offsets[2 * self._start]
+        self._buffer = self._buffer[base:]
+        self._offsets = array("Q", (offset - base for offset in self._offsets[2 * self._start:]))
+        self._lang_ids = self._lang_ids[2 * self._start:]
+        self._start = 0
+
+    def __len__(self) -> int:
+        return len(self._lang_ids) // 2 - self._start
+
+    def __getitem__(self, index: int) -> HistoryRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Индекс записи истории вне диапазона")
+        i = index + self._start
+        start, middle, end = self._offsets[2 * i], self._offsets[2 * i + 1], self._offsets[2 * i + 2]
+        return HistoryRecord(
+            self._languages[self._lang_ids[2 * i]],
+            self._buffer[start:middle].decode("utf-8"),
+            self._languages[self._lang_ids[2 * i + 1]],
+            self._buffer[middle:end].decode("utf-8"),
+        )
+
+    def __iter__(self) -> Iterator[HistoryRecord]:
+        for index in range(len(self)):
+            yield self[index]
@@ -1,9 +1,19 @@
+import os
+from typing import Callable, Union
+
 from deep_translator import GoogleTranslator
-from PyQt5.QtCore import Qt, QTimer, pyqtSlot
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSlot
 from PyQt5.QtGui import QFont, QFontMetrics, QMouseEvent
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel
 
+from bulk import BulkTranslationWorker
 from config import Config
+from history import HistoryLog, HistoryRecord
+from model_registry import ModelRegistry
+from pipeline import RemoteBackend, TranslationPipeline
+
+# Соответствие языков кодам для GoogleTranslator
+GOOGLE_LANG_CODES = {"Русский": "ru", "Алеутский": "en"}
 
 
 class TranslatorLogic:
@@ -12,7 +22,8 @@ class TranslatorLogic:
     def __init__(self, ui: "TranslatorApp"):
         """Инициализирует логику переводчика."""
         self.ui = ui
-        self.translation_history = []
+        # История хранится компактно и ограничена Config.HISTORY_LIMIT записями
+        self.translation_history = HistoryLog(Config.HISTORY_LIMIT)
         self.source_lang = "Русский"
         self.target_lang = "Алеутский"
         self.old_pos = None
@@ -20,25 +31,56 @@ class TranslatorLogic:
         self.resize_direction = 0
         self.resize_margin = 10
 
+        # Состояние массового перевода: большой текст или список перетащенных файлов
+        self.bulk_source = None
+        self.bulk_thread = None
+        self.bulk_worker = None
+        # Действие с полями, отложенное до остановки текущего массового перевода
+        self.after_bulk_action = None
+
+        # Шрифты карточек истории создаются один раз и переиспользуются
+        self.history_font = QFont("Arial", 14)
+        self.history_font_bold = QFont("Arial", 14, QFont.Bold)
+        self.history_font_metrics = QFontMetrics(self.history_font)
+
+        # Реестр обученных моделей с подменой версии без перезапуска
+        self.model_registry = ModelRegistry(Config.MODELS_PATH)
+        self.model_registry.start()
+
+    def translate(self, text: str, source: str, target: str, mode: str = "interactive") -> str:
+        """Переводит текст между указанными языками (названия, как на метках).
+
+        Режим ("interactive" или "bulk") определяет, какая модель обработает запрос.
+        """
+        translated = None
+        # Перевод с русского на алеутский выполняет обученная модель, если она загружена
+        if source == "Русский":
+            translated = self.model_registry.translate(text, mode)
+        if translated is None:
+            translator = GoogleTranslator(
+                source=GOOGLE_LANG_CODES[source], target=GOOGLE_LANG_CODES[target]
+            )
+            translated = translator.translate(text)
+        # Проверяем, если результат в байтах, декодируем в строку
+        if isinstance(translated, bytes):
+            translated = translated.decode("utf-8")
+        return translated
+
     @pyqtSlot()
     def translate_text(self) -> None:
         """Переводит текст из поля ввода и отображает результат в поле вывода."""
+        if self.bulk_source is not None:
+            self.start_bulk_translation(self.bulk_source)
+            return
+
         try:
             input_text = self.ui.input_field.toPlainText().strip()
-            # Соответствие языков кодам для GoogleTranslator
-            lang_map = {"Русский": "ru", "Алеутский": "en"}
-            source_lang = lang_map[self.source_lang]
-            target_lang = lang_map[self.target_lang]
 
             if not input_text:
                 self.ui.output_field.setText("Ошибка: Введите текст для перевода")
                 return
 
-            translator = GoogleTranslator(source=source_lang, target=target_lang)
-            translated = translator.translate(input_text)
-            # Проверяем, если результат в байтах, декодируем в строку
-            if isinstance(translated, bytes):
-                translated = translated.decode("utf-8")
+            translated = self.translate(input_text, self.source_lang, self.target_lang)
             # Отображаем переведённый текст или сообщение об ошибке
             self.ui.output_field.setText(
                 translated if translated else "Ошибка: Не удалось перевести текст"
@@ -46,23 +88,20 @@ class TranslatorLogic:
 
             if translated:
                 # Добавляем перевод в историю
-                history_entry = {
-                    "source_lang": self.source_lang,
-                    "input_text": input_text,
-                    "target_lang": self.target_lang,
-                    "translated_text": translated,
-                }
+                history_entry = HistoryRecord.create(
+                    self.source_lang, input_text, self.target_lang, translated
+                )
                 self.translation_history.append(history_entry)
-                # Ограничиваем историю 10 записями
-                if len(self.translation_history) > 10:
-                    self.translation_history.pop(0)
-                self.update_history()
+                self.add_history_card(history_entry)
 
         except Exception as e:
             self.ui.output_field.setText(f"Ошибка перевода: {str(e)}")
 
     def swap_languages(self) -> None:
         """Меняет местами языки перевода и обновляет поля ввода/вывода."""
+        if self.bulk_thread is not None:
+            self.run_after_bulk(self.swap_languages)
+            return
         # Меняем языки местами
         self.source_lang, self.target_lang = self.target_lang, self.source_lang
         # Обновляем метки языков
@@ -77,10 +116,150 @@ class TranslatorLogic:
 
     def on_input_text_changed(self) -> None:
         """Обрабатывает изменение текста в поле ввода."""
+        # Правка поля ввода отменяет загруженный большой текст
+        self.bulk_source = None
+        self.ui.error_label.hide()
+        # Поле вывода очищается, только когда фоновый поток перестанет дописывать в него перевод
+        self.run_after_bulk(self.ui.output_field.clear)
+
+    def load_bulk_text(self, text: str) -> None:
+        """Принимает большой текст из буфера обмена и запускает его перевод."""
+        if self.bulk_thread is not None:
+            # Новый текст заменяет тот, что переводится сейчас
+            self.run_after_bulk(lambda: self.load_bulk_text(text))
+            return
+        self.bulk_source = text
+        self.start_bulk_translation(text)
+
+    def load_bulk_files(self, paths: list[str]) -> None:
+        """Принимает перетащенные файлы и запускает перевод их содержимого."""
+        # Папки и специальные файлы пропускаем
+        files = [path for path in paths if os.path.isfile(path)]
+        if not files:
+            self.show_error("Перетащите текстовый файл")
+            return
+        if self.bulk_thread is not None:
+            self.run_after_bulk(lambda: self.load_bulk_files(files))
+            return
+        self.bulk_source = files
+        self.start_bulk_translation(files)
+
+    def start_bulk_translation(self, source: Union[str, list[str]]) -> None:
+        """Запускает пофрагментный перевод большого текста или файлов в фоновом потоке."""
+        if self.bulk_thread is not None:
+            self.run_after_bulk(lambda: self.start_bulk_translation(source))
+            return
+
+        self.bulk_worker = BulkTranslationWorker(
+            source,
+            self.create_pipeline(self.source_lang, self.target_lang),
+        )
+        self.bulk_thread = QThread()
+        self.bulk_worker.moveToThread(self.bulk_thread)
+        self.bulk_thread.started.connect(self.bulk_worker.run)
+        self.bulk_worker.text_loaded.connect(self.on_bulk_text_loaded)
+        self.bulk_worker.load_failed.connect(self.on_bulk_load_failed)
+        self.bulk_worker.chunk_translated.connect(self.ui.output_field.appendChunk)
+        self.bulk_worker.progress.connect(self.on_bulk_progress)
+        self.bulk_worker.failed.connect(self.on_bulk_failed)
+        self.bulk_worker.finished.connect(self.on_bulk_finished)
+
         self.ui.error_label.hide()
         self.ui.output_field.clear()
-        if not self.ui.input_field.toPlainText().strip():
-            self.ui.output_field.clear()
+        self.ui.bulk_progress.setRange(0, 0)
+        self.ui.bulk_widget.show()
+        self.ui.translate_button.setEnabled(False)
+        self.bulk_thread.start()
+
+    def on_bulk_text_loaded(self, preview: str, length: int) -> None:
+        """Показывает начало загруженного текста и настраивает индикатор прогресса."""
+        if self.after_bulk_action is not None:
+            # Перевод уже отменён правкой полей, не затираем её предпросмотром
+            return
+        # В поле ввода показываем только начало текста, чтобы не загружать его целиком
+        self.ui.input_field.blockSignals(True)
+        self.ui.input_field.setPlainText(
+            f"{preview}…\n\n[Загружен большой текст: {length} символов]"
+        )
+        self.ui.input_field.blockSignals(False)
+        self.ui.bulk_progress.setRange(0, length)
+        self.ui.bulk_progress.setValue(0)
+
+    def on_bulk_load_failed(self, message: str) -> None:
+        """Сообщает, что перетащенный файл не удалось прочитать."""
+        self.bulk_source = None
+        self.show_error(message)
+
+    def show_error(self, message: str) -> None:
+        """Показывает сообщение об ошибке поверх поля вывода."""
+        self.ui.error_label.setText(message)
+        self.ui.error_label.show()
+
+    def create_pipeline(self, source: str, target: str) -> TranslationPipeline:
+        """Создаёт конвейер перевода на модели для больших текстов или на Google Translate."""
+        backend = self.model_registry.engine_for("bulk") if source == "Русский" else None
+        # Модель получает отдельные предложения (см. Config.MODEL_SEGMENT_SIZE)
+        segment_size, sentences = Config.MODEL_SEGMENT_SIZE, True
+        if backend is None:
+            segment_size, sentences = Config.BULK_CHUNK_SIZE, False
+            source_code, target_code = GOOGLE_LANG_CODES[source], GOOGLE_LANG_CODES[target]
+            translator = GoogleTranslator(source=source_code, target=target_code)
+            backend = RemoteBackend(translator.translate, f"google:{source_code}-{target_code}")
+        return TranslationPipeline(
+            backend,
+            self.model_registry.bulk_cache,
+            segment_size=segment_size,
+            sentences=sentences,
+            batch_size=Config.PIPELINE_BATCH_SIZE,
+            queue_size=Config.PIPELINE_QUEUE_SIZE,
+        )
+
+    def run_after_bulk(self, action: Callable[[], None]) -> None:
+        """Выполняет действие с полями сразу или после отмены текущего массового перевода.
+
+        Переводы фрагментов приходят в основной поток раньше сигнала завершения,
+        поэтому отложенное действие уже не увидит дописанный после него текст.
+        """
+        if self.bulk_thread is None:
+            action()
+            return
+        self.after_bulk_action = action
+        self.cancel_bulk_translation()
+
+    def cancel_bulk_translation(self) -> None:
+        """Останавливает массовый перевод после текущего фрагмента."""
+        if self.bulk_worker is not None:
+            self.bulk_worker.cancel()
+
+    def stop_bulk_translation(self) -> None:
+        """Отменяет массовый перевод и дожидается завершения фонового потока."""
+        if self.bulk_thread is not None:
+            self.bulk_worker.cancel()
+            self.bulk_thread.quit()
+            self.bulk_thread.wait()
+
+    def on_bulk_progress(self, done: int, total: int) -> None:
+        """Обновляет индикатор прогресса массового перевода."""
+        self.ui.bulk_progress.setValue(done)
+
+    def on_bulk_failed(self, message: str) -> None:
+        """Показывает ошибку массового перевода под уже переведённой частью."""
+        self.ui.output_field.appendChunk(f"\n\nОшибка перевода: {message}")
+
+    def on_bulk_finished(self) -> None:
+        """Завершает фоновый поток и возвращает интерфейс в обычный режим."""
+        self.bulk_thread.quit()
+        self.bulk_thread.wait()
+        self.bulk_worker.deleteLater()
+        self.bulk_thread.deleteLater()
+        self.bulk_worker = None
+        self.bulk_thread = None
+        self.ui.bulk_widget.hide()
+        self.ui.translate_button.setEnabled(True)
+
+        action, self.after_bulk_action = self.after_bulk_action, None
+        if action is not None:
+            action()
 
     def copy_output_text(self) -> None:
         """Копирует текст из поля вывода в буфер обмена."""
@@ -146,94 +325,102 @@ class TranslatorLogic:
         if was_maximized:
             self.ui.showMaximized()
 
-    def update_history(self) -> None:
-        """Обновляет отображение истории переводов."""
-        # Очищаем текущую историю, кроме последнего элемента (spacer)
-        while self.ui.history_layout.count() > 1:
-            item = self.ui.history_layout.takeAt(0)
+    def add_history_card(self, entry: HistoryRecord) -> None:
+        """Добавляет карточку новой записи, не пересоздавая остальные карточки."""
+        self.ui.history_layout.insertWidget(0, self.create_history_card(entry))
+
+        # Удаляем самые старые карточки (перед spacer), если их больше, чем записей в истории
+        while self.ui.history_layout.count() - 1 > len(self.translation_history):
+            item = self.ui.history_layout.takeAt(self.ui.history_layout.count() - 2)
             if item.widget():
                 item.widget().deleteLater()
 
-        # Добавляем карточки для каждой записи в истории
-        for entry in self.translation_history:
-            card = QWidget()
-            card.setObjectName("historyCard")
-            card_layout = QVBoxLayout(card)
-            card_layout.setSpacing(2)
-            card_layout.setContentsMargins(10, 5, 10, 5)
-
-            # Настраиваем шрифты для меток
-            font = QFont("Arial", 14)
-            font_bold = QFont("Arial", 14, QFont.Bold)
-            font_metrics = QFontMetrics(font)
-
-            # Метка для исходного языка
-            source_lang_label = QLabel(entry["source_lang"])
-            source_lang_label.setObjectName("historyLangLabel")
-            source_lang_label.setFont(font_bold)
-            source_lang_label.setFixedHeight(
-                font_metrics.boundingRect(entry["source_lang"]).height()
-            )
-            source_lang_label.setFixedWidth(Config.HISTORY_CARD_WIDTH - 20)
-            card_layout.addWidget(source_lang_label)
-
-            # Метка для исходного текста
-            source_text_label = QLabel(entry["input_text"])
-            source_text_label.setObjectName("historyTextLabel")
-            source_text_label.setFont(font)
-            source_text_label.setWordWrap(False)
-            source_text_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
-            elided_text = font_metrics.elidedText(
-                entry["input_text"], Qt.ElideRight, Config.HISTORY_CARD_WIDTH + 35
-            )
-            source_text_label.setText(elided_text)
-            source_text_label.setFixedHeight(
-                font_metrics.boundingRect(entry["input_text"]).height()
-            )
-            source_text_label.setFixedWidth(Config.HISTORY_CARD_WIDTH - 20)
-            card_layout.addWidget(source_text_label)
-
-            # Метка для целевого языка
-            target_lang_label = QLabel(entry["target_lang"])
-            target_lang_label.setObjectName("historyLangLabel")
-            target_lang_label.setFont(font_bold)
-            target_lang_label.setFixedHeight(
-                font_metrics.boundingRect(entry["target_lang"]).height()
-            )
-            target_lang_label.setFixedWidth(Config.HISTORY_CARD_WIDTH - 20)
-            card_layout.addWidget(target_lang_label)
-
-            # Метка для переведённого текста
-            target_text_label = QLabel(entry["translated_text"])
-            target_text_label.setObjectName("historyTextLabel")
-            target_text_label.setFont(font)
-            target_text_label.setWordWrap(False)
-            target_text_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
-            elided_text = font_metrics.elidedText(
-                entry["translated_text"], Qt.ElideRight, Config.HISTORY_CARD_WIDTH + 35
-            )
-            target_text_label.setText(elided_text)
-            target_text_label.setFixedHeight(
-                font_metrics.boundingRect(entry["translated_text"]).height()
-            )
-            target_text_label.setFixedWidth(Config.HISTORY_CARD_WIDTH - 20)
-            card_layout.addWidget(target_text_label)
-
-            # Устанавливаем фиксированный размер карточки
-            card.setFixedHeight(Config.HISTORY_CARD_HEIGHT)
-            card.setProperty("entry", entry)
-            card.mousePressEvent = lambda event, c=card: self.on_card_clicked(c)
-            self.ui.history_layout.insertWidget(0, card)
+    def create_history_card(self, entry: HistoryRecord) -> QWidget:
+        """Создаёт карточку истории для указанной записи."""
+        card = self.ui.create_history_card()
+        card_layout = QVBoxLayout(card)
+        card_layout.setSpacing(2)
+        card_layout.setContentsMargins(10, 5, 10, 5)
+
+        font = self.history_font
+        font_bold = self.history_font_bold
+        font_metrics = self.history_font_metrics
+        source_lang = Config.LANG_NAMES[entry.source_lang]
+        target_lang = Config.LANG_NAMES[entry.target_lang]
+
+        # Метка для исходного языка
+        source_lang_label = QLabel(source_lang)
+        source_lang_label.setObjectName("historyLangLabel")
+        source_lang_label.setFont(font_bold)
+        source_lang_label.setFixedHeight(
+            font_metrics.boundingRect(source_lang).height()
+        )
+        source_lang_label.setFixedWidth(Config.HISTORY_CARD_WIDTH - 20)
+        card_layout.addWidget(source_lang_label)
+
+        # Метка для исходного текста
+        source_text_label = QLabel(entry.input_text)
+        source_text_label.setObjectName("historyTextLabel")
+        source_text_label.setFont(font)
+        source_text_label.setWordWrap(False)
+        source_text_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        elided_text = font_metrics.elidedText(
+            entry.input_text, Qt.ElideRight, Config.HISTORY_CARD_WIDTH + 35
+        )
+        source_text_label.setText(elided_text)
+        source_text_label.setFixedHeight(
+            font_metrics.boundingRect(entry.input_text).height()
+        )
+        source_text_label.setFixedWidth(Config.HISTORY_CARD_WIDTH - 20)
+        card_layout.addWidget(source_text_label)
+
+        # Метка для целевого языка
+        target_lang_label = QLabel(target_lang)
+        target_lang_label.setObjectName("historyLangLabel")
+        target_lang_label.setFont(font_bold)
+        target_lang_label.setFixedHeight(
+            font_metrics.boundingRect(target_lang).height()
+        )
+        target_lang_label.setFixedWidth(Config.HISTORY_CARD_WIDTH - 20)
+        card_layout.addWidget(target_lang_label)
+
+        # Метка для переведённого текста
+        target_text_label = QLabel(entry.translated_text)
+        target_text_label.setObjectName("historyTextLabel")
+        target_text_label.setFont(font)
+        target_text_label.setWordWrap(False)
+        target_text_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        elided_text = font_metrics.elidedText(
+            entry.translated_text, Qt.ElideRight, Config.HISTORY_CARD_WIDTH + 35
+        )
+        target_text_label.setText(elided_text)
+        target_text_label.setFixedHeight(
+            font_metrics.boundingRect(entry.translated_text).height()
+        )
+        target_text_label.setFixedWidth(Config.HISTORY_CARD_WIDTH - 20)
+        card_layout.addWidget(target_text_label)
+
+        # Устанавливаем фиксированный размер карточки
+        card.setFixedHeight(Config.HISTORY_CARD_HEIGHT)
+        card.entry = entry
+        card.mousePressEvent = lambda event, c=card: self.on_card_clicked(c)
+        return card
 
     def on_card_clicked(self, card: QWidget) -> None:
         """Обрабатывает клик по карточке истории, заполняя поля ввода и вывода."""
-        entry = card.property("entry")
+        if self.bulk_thread is not None:
+            self.run_after_bulk(lambda: self.on_card_clicked(card))
+            return
+        entry = card.entry
         if entry:
-            self.ui.input_field.setText(entry["input_text"])
-            self.ui.output_field.setText(entry["translated_text"])
+            self.ui.input_field.setText(entry.input_text)
+            self.ui.output_field.setText(entry.translated_text)
 
     def clear_fields(self) -> None:
         """Очищает поля ввода и вывода."""
+        if self.bulk_thread is not None:
+            self.run_after_bulk(self.clear_fields)
+            return
         self.ui.input_field.clear()
         self.ui.output_field.clear()
 
@@ -1,5 +1,6 @@
 import sys
 from PyQt5.QtWidgets import QApplication
+from theme import apply_theme
 from ui import TranslatorApp
 
 
@@ -7,6 +8,9 @@ if __name__ == "__main__":
     # Создаём экземпляр приложения PyQt5
     application = QApplication(sys.argv)
 
+    # Загружаем и применяем стили один раз до создания виджетов
+    apply_theme(application)
+
     # Создаём и отображаем главное окно приложения
     main_window = TranslatorApp()
     main_window.show()
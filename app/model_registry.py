@@ -0,0 +1,231 @@
+import os
+import threading
+import time
+from typing import Optional
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from cache import TranslationCache
+from config import Config
+from engine import MarianEngine, model_version, release_memory
+from pipeline import join_segment, split_into_sentences
+
+
+class ModelRegistry(QObject):
+    """Класс, следящий за папкой моделей и подменяющий модель без перезапуска.
+
+    Модели делятся на роли: "student" — дистиллированная модель (в папке есть
+    distill.json), "teacher" — полная модель. Запросы распределяются по ролям
+    согласно Config.MODEL_ROUTES.
+    """
+
+    model_switched = pyqtSignal(str)
+    model_failed = pyqtSignal(str, str)
+
+    def __init__(self, models_path: str = Config.MODELS_PATH, parent: QObject = None) -> None:
+        """Инициализирует реестр моделей для указанной папки."""
+        super().__init__(parent)
+        self.models_path = models_path
+        self.cache = TranslationCache()
+        # Фрагменты больших текстов кэшируются отдельно, чтобы не вытеснять интерактивные фразы
+        self.bulk_cache = TranslationCache(Config.BULK_CACHE_SIZE)
+        self._engines = {"teacher": None, "student": None}
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        self._loading_version = None
+        # Версия, которую не удалось загрузить, по папке модели; сбрасывается при изменении папки
+        self._failed_versions = {}
+
+        # Откладываем проверку папки: копирование модели порождает много событий
+        self._scan_timer = QTimer(self)
+        self._scan_timer.setSingleShot(True)
+        self._scan_timer.setInterval(Config.MODEL_SCAN_DELAY_MS)
+        self._scan_timer.timeout.connect(self.scan)
+
+        # Следим за самой папкой моделей, папками версий и их config.json
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_path_changed)
+        self._watcher.fileChanged.connect(self._on_path_changed)
+
+        # Загрузка идёт в фоновом потоке, а повторная проверка — в основном
+        self.model_switched.connect(self._on_load_finished)
+        self.model_failed.connect(self._on_load_finished)
+
+    def start(self) -> None:
+        """Начинает наблюдение за папкой моделей (создаёт её при отсутствии) и загружает последнюю версию."""
+        os.makedirs(self.models_path, exist_ok=True)
+        self.scan()
+
+    def _on_path_changed(self, path: str) -> None:
+        """Разрешает повторную загрузку изменившейся папки модели и откладывает проверку."""
+        model_dir = path if os.path.isdir(path) else os.path.dirname(path)
+        with self._lock:
+            self._failed_versions.pop(os.path.normpath(model_dir), None)
+        self._scan_timer.start()
+
+    def _on_load_finished(self, *args) -> None:
+        """Проверяет, не появились ли новые версии во время загрузки."""
+        self.scan()
+
+    def active_version(self, role: str) -> Optional[str]:
+        """Возвращает версию активной модели роли или None, если модель не загружена."""
+        engine = self._engines[role]
+        return engine.version if engine else None
+
+    def scan(self) -> None:
+        """Ищет роль, для которой появилась новая версия модели, и загружает её в фоне."""
+        with self._scan_lock:
+            self._watch_model_dirs()
+            if self._loading_version is not None:
+                # Папка будет проверена снова после завершения текущей загрузки
+                return
+            latest, changing = self.find_latest_versions()
+            if changing:
+                # Модель ещё копируется или сохраняется: проверяем папку снова, пока файлы не допишутся.
+                # Неполные папки, которые не меняются, ждут события наблюдателя
+                self._scan_timer.start()
+            for role, (model_dir, version) in latest.items():
+                if version == self.active_version(role):
+                    continue
+                with self._lock:
+                    failed = self._failed_versions.get(os.path.normpath(model_dir)) == version
+                if failed:
+                    continue
+                self._loading_version = version
+                thread = threading.Thread(
+                    target=self._load_version, args=(role, model_dir, version), daemon=True
+                )
+                thread.start()
+                return
+
+    def find_latest_versions(self) -> tuple[dict, bool]:
+        """Возвращает путь и версию самой свежей готовой модели для каждой роли.
+
+        Второй элемент результата — есть ли папки, файлы которых менялись
+        в последние MODEL_SCAN_DELAY_MS (модель ещё копируется или сохраняется).
+        """
+        candidates = {}
+        changing = False
+        for name in os.listdir(self.models_path):
+            model_dir = os.path.join(self.models_path, name)
+            if not os.path.isdir(model_dir):
+                continue
+            try:
+                state = self._folder_state(model_dir)
+                if state != "ready":
+                    changing = changing or state == "changing"
+                    continue
+                version = model_version(model_dir)
+            except OSError:
+                # Файлы удалили или заменили во время проверки
+                changing = True
+                continue
+            role = "student" if os.path.isfile(os.path.join(model_dir, "distill.json")) else "teacher"
+            candidate = (int(version.rsplit("@", 1)[1]), model_dir, version)
+            candidates[role] = max(candidates.get(role, candidate), candidate)
+
+        latest = {role: (model_dir, version) for role, (_, model_dir, version) in candidates.items()}
+        return latest, changing
+
+    def _folder_state(self, model_dir: str) -> str:
+        """Возвращает состояние папки модели.
+
+        "changing" — папка или её файлы менялись в последние MODEL_SCAN_DELAY_MS,
+        "incomplete" — не хватает файлов модели (например, это папка не с моделью),
+        "ready" — модель можно загружать.
+        """
+        names = os.listdir(model_dir)
+        newest = max(
+            [os.path.getmtime(model_dir)]
+            + [os.path.getmtime(os.path.join(model_dir, name)) for name in names]
+        )
+        if time.time() - newest < Config.MODEL_SCAN_DELAY_MS / 1000:
+            return "changing"
+        names = set(names)
+        if not set(Config.MODEL_REQUIRED_FILES) <= names or not names & set(Config.MODEL_WEIGHT_FILES):
+            return "incomplete"
+        return "ready"
+
+    def _watch_model_dirs(self) -> None:
+        """Добавляет в наблюдение новые папки моделей и их config.json.
+
+        Наблюдатель перестаёт следить за удалёнными или заменёнными путями,
+        поэтому список обновляется при каждой проверке.
+        """
+        watched = set(self._watcher.directories()) | set(self._watcher.files())
+        paths = [self.models_path]
+        for entry in os.scandir(self.models_path):
+            if entry.is_dir():
+                paths.append(entry.path)
+                config_path = os.path.join(entry.path, "config.json")
+                if os.path.isfile(config_path):
+                    paths.append(config_path)
+        new_paths = [path for path in paths if path not in watched]
+        if new_paths:
+            self._watcher.addPaths(new_paths)
+
+    def _load_version(self, role: str, model_dir: str, version: str) -> None:
+        """Загружает и прогревает модель, затем атомарно делает её активной для роли."""
+        try:
+            # Ученик отвечает за интерактивные запросы, поэтому декодирует жадно
+            num_beams = Config.STUDENT_NUM_BEAMS if role == "student" else Config.NUM_BEAMS
+            engine = MarianEngine(
+                model_dir, version, num_beams=num_beams, max_length=Config.MAX_LENGTH
+            )
+            engine.warm_up(Config.WARMUP_PHRASES)
+        except Exception as e:
+            with self._lock:
+                self._failed_versions[os.path.normpath(model_dir)] = version
+            self._loading_version = None
+            self.model_failed.emit(version, str(e))
+            return
+
+        with self._lock:
+            old_engine, self._engines[role] = self._engines[role], engine
+        self._loading_version = None
+
+        # Освобождаем кэш и веса предыдущей версии
+        if old_engine is not None:
+            self.cache.invalidate(old_engine.version)
+            self.bulk_cache.invalidate(old_engine.version)
+            del old_engine
+            release_memory()
+        self.model_switched.emit(version)
+
+    def engine_for(self, mode: str) -> Optional[MarianEngine]:
+        """Возвращает модель для режима запроса, а при её отсутствии — модель другой роли."""
+        preferred = Config.MODEL_ROUTES[mode]
+        with self._lock:
+            engine = self._engines[preferred]
+            if engine is None:
+                fallback = "teacher" if preferred == "student" else "student"
+                engine = self._engines[fallback]
+        return engine
+
+    def translate(self, text: str, mode: str = "interactive") -> Optional[str]:
+        """Переводит текст моделью для режима запроса или возвращает None, если моделей нет.
+
+        Модель обрезает вход до Config.MAX_LENGTH токенов, поэтому текст делится на
+        предложения, которые переводятся пакетами, а переводы собираются с теми же
+        переводами строк между ними.
+        """
+        engine = self.engine_for(mode)
+        if engine is None:
+            return None
+
+        segments = list(split_into_sentences(text, Config.MODEL_SEGMENT_SIZE))
+        # Пробельные фрагменты не переводятся, как и в конвейере массового перевода
+        results = [
+            self.cache.get(engine.version, segment.strip()) if segment.strip() else ""
+            for segment in segments
+        ]
+        pending = [i for i, translated in enumerate(results) if translated is None]
+        for start in range(0, len(pending), Config.PIPELINE_BATCH_SIZE):
+            batch = pending[start:start + Config.PIPELINE_BATCH_SIZE]
+            translations = engine.translate_batch([segments[i].strip() for i in batch])
+            for i, translated in zip(batch, translations):
+                results[i] = translated
+                self.cache.put(engine.version, segments[i].strip(), translated)
+        return "".join(
+            join_segment(segment, translated) for segment, translated in zip(segments, results)
+        ).strip()
@@ -0,0 +1,320 @@
+import queue
+import re
+import threading
+import time
+from typing import Callable, Iterator
+
+# Маркер конца потока данных между стадиями
+_END = object()
+
+# Предложение: текст до знака конца предложения перед пробелом, до перевода строки или до конца
+SENTENCE_RE = re.compile(r".*?(?:[.!?…]+(?=\s|$)|\n|$)\s*", re.S)
+
+
+def split_into_chunks(text: str, chunk_size: int) -> Iterator[str]:
+    """Делит текст на фрагменты не длиннее chunk_size, стараясь резать по абзацам и предложениям."""
+    start = 0
+    length = len(text)
+    while start < length:
+        end = min(start + chunk_size, length)
+        if end < length:
+            # Ищем ближайшую границу абзаца, затем предложения, затем пробел
+            for separator in ("\n", ". ", " "):
+                cut = text.rfind(separator, start, end)
+                if cut > start:
+                    end = cut + len(separator)
+                    break
+        yield text[start:end]
+        start = end
+
+
+def split_into_sentences(text: str, max_size: int) -> Iterator[str]:
+    """Делит текст на отдельные предложения, вместе с пробелами после них.
+
+    Предложения длиннее max_size дополнительно режутся по пробелам.
+    """
+    for match in SENTENCE_RE.finditer(text):
+        sentence = match.group()
+        if len(sentence) > max_size:
+            yield from split_into_chunks(sentence, max_size)
+        elif sentence:
+            yield sentence
+
+
+def join_segment(segment: str, translated: str) -> str:
+    """Возвращает перевод фрагмента с разделителем, сохраняющим переводы строк между фрагментами."""
+    trailing = segment[len(segment.rstrip()):]
+    return translated + (trailing if "\n" in trailing else " ")
+
+
+class StageMetrics:
+    """Класс счётчиков одной стадии конвейера."""
+
+    def __init__(self, name: str) -> None:
+        """Инициализирует нулевые счётчики стадии с указанным именем."""
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.blocked_seconds = 0.0
+
+    def __str__(self) -> str:
+        """Возвращает счётчики стадии одной строкой для отчёта."""
+        return (
+            f"{self.name}: пакетов {self.batches}, элементов {self.items}, "
+            f"работа {self.busy_seconds:.3f} с, ожидание входа {self.wait_seconds:.3f} с, "
+            f"блокировка выхода {self.blocked_seconds:.3f} с"
+        )
+
+
+class Batch:
+    """Класс пакета фрагментов, проходящего через стадии конвейера."""
+
+    def __init__(self, texts: list[str]) -> None:
+        """Инициализирует пакет фрагментов без переводов."""
+        self.texts = texts
+        self.results = [None] * len(texts)
+        # Номера фрагментов, которых нет в кэше, и промежуточные данные для них
+        self.pending = []
+        self.payload = None
+
+
+class RemoteBackend:
+    """Класс-адаптер удалённого переводчика к стадиям конвейера.
+
+    У удалённого сервиса нет отдельной токенизации, поэтому её стадии
+    пропускают тексты без изменений, а весь перевод выполняется на стадии вывода.
+    """
+
+    def __init__(self, translate: Callable[[str], str], version: str) -> None:
+        """Инициализирует адаптер функцией перевода и версией для ключей кэша."""
+        self.translate = translate
+        self.version = version
+
+    def tokenize(self, texts: list[str]) -> list[str]:
+        """Возвращает тексты без изменений: токенизацию выполняет сервис."""
+        return texts
+
+    def generate(self, texts: list[str]) -> list[str]:
+        """Переводит тексты по одному запросом к сервису."""
+        return [self.translate(text) or "" for text in texts]
+
+    def decode(self, texts: list[str]) -> list[str]:
+        """Возвращает переводы без изменений: сервис отдаёт готовые строки."""
+        return texts
+
+
+class TranslationPipeline:
+    """Класс многостадийного конвейера перевода с ограниченными очередями между стадиями.
+
+    Стадии (сегментация, поиск в кэше, токенизация, вывод модели, декодирование,
+    сохранение) работают в отдельных потоках, поэтому токенизация следующего пакета
+    и сохранение предыдущего идут одновременно с выводом модели для текущего.
+    Ограниченные очереди задают обратное давление: быстрые стадии ждут медленные,
+    не накапливая данные в памяти.
+
+    backend — объект с методами tokenize, generate, decode и атрибутом version
+    (MarianEngine или RemoteBackend), cache — TranslationCache или None.
+    При sentences=True текст делится на отдельные предложения (не длиннее
+    segment_size), иначе — на фрагменты до segment_size символов.
+    """
+
+    STAGES = ("segment", "cache", "tokenize", "inference", "decode", "persist")
+
+    def __init__(
+        self,
+        backend,
+        cache=None,
+        segment_size: int = 2000,
+        sentences: bool = False,
+        batch_size: int = 8,
+        queue_size: int = 2,
+    ) -> None:
+        """Инициализирует конвейер для модели или удалённого переводчика."""
+        self.backend = backend
+        self.cache = cache
+        self.segment_size = segment_size
+        self.sentences = sentences
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.metrics = [StageMetrics(name) for name in self.STAGES]
+        self.wall_seconds = 0.0
+        self._cancelled = threading.Event()
+        self._error = None
+
+    def cancel(self) -> None:
+        """Запрашивает остановку конвейера после пакетов, которые уже обрабатываются."""
+        self._cancelled.set()
+
+    def run(self, text: str, on_result: Callable[[str, str], None]) -> None:
+        """Переводит текст по фрагментам и вызывает on_result(фрагмент, перевод) в исходном порядке.
+
+        Пробельные фрагменты не переводятся (перевод — пустая строка).
+        Исключение любой стадии останавливает конвейер и пробрасывается вызывающему.
+        """
+        started = time.perf_counter()
+        queues = [queue.Queue(self.queue_size) for _ in range(len(self.STAGES) - 1)]
+        handlers = [self._cache_lookup, self._tokenize, self._infer, self._decode]
+
+        threads = [
+            threading.Thread(
+                target=self._source_stage, args=(text, queues[0], self.metrics[0]), daemon=True
+            )
+        ]
+        for i, handler in enumerate(handlers):
+            threads.append(threading.Thread(
+                target=self._stage,
+                args=(handler, queues[i], queues[i + 1], self.metrics[i + 1]),
+                daemon=True,
+            ))
+        for thread in threads:
+            thread.start()
+
+        # Стадия сохранения выполняется в вызывающем потоке, чтобы результаты шли по порядку
+        self._sink_stage(queues[-1], on_result, self.metrics[-1])
+        for thread in threads:
+            thread.join()
+        self.wall_seconds = time.perf_counter() - started
+        if self._error is not None:
+            raise self._error
+
+    def _put(self, output: queue.Queue, item, metrics: StageMetrics) -> None:
+        """Передаёт элемент следующей стадии, учитывая время блокировки на полной очереди."""
+        started = time.perf_counter()
+        output.put(item)
+        metrics.blocked_seconds += time.perf_counter() - started
+
+    def _source_stage(self, text: str, output: queue.Queue, metrics: StageMetrics) -> None:
+        """Делит текст на фрагменты и собирает их в пакеты (стадия сегментации)."""
+        try:
+            texts = []
+            started = time.perf_counter()
+            if self.sentences:
+                segments = split_into_sentences(text, self.segment_size)
+            else:
+                segments = split_into_chunks(text, self.segment_size)
+            for segment in segments:
+                if self._cancelled.is_set():
+                    break
+                texts.append(segment)
+                if len(texts) == self.batch_size:
+                    metrics.busy_seconds += time.perf_counter() - started
+                    metrics.batches += 1
+                    metrics.items += len(texts)
+                    self._put(output, Batch(texts), metrics)
+                    texts = []
+                    started = time.perf_counter()
+            if texts and not self._cancelled.is_set():
+                metrics.busy_seconds += time.perf_counter() - started
+                metrics.batches += 1
+                metrics.items += len(texts)
+                self._put(output, Batch(texts), metrics)
+        except Exception as e:
+            self._fail(e)
+        output.put(_END)
+
+    def _stage(self, handler: Callable[[Batch], int], source: queue.Queue,
+               output: queue.Queue, metrics: StageMetrics) -> None:
+        """Обрабатывает пакеты из входной очереди и передаёт их в выходную.
+
+        Обработчик возвращает число фрагментов, которые он обработал: поиск в кэше
+        проверяет весь пакет, следующие стадии — только фрагменты, которых не было в кэше.
+        """
+        while True:
+            started = time.perf_counter()
+            batch = source.get()
+            metrics.wait_seconds += time.perf_counter() - started
+            if batch is _END:
+                break
+            # После ошибки или отмены только пропускаем оставшиеся пакеты до маркера конца
+            if self._error is not None or self._cancelled.is_set():
+                continue
+            started = time.perf_counter()
+            try:
+                items = handler(batch)
+            except Exception as e:
+                self._fail(e)
+                continue
+            metrics.busy_seconds += time.perf_counter() - started
+            metrics.batches += 1
+            metrics.items += items
+            self._put(output, batch, metrics)
+        output.put(_END)
+
+    def _sink_stage(self, source: queue.Queue, on_result: Callable[[str, str], None],
+                    metrics: StageMetrics) -> None:
+        """Сохраняет переводы в кэш и отдаёт их вызывающему (стадия сохранения)."""
+        while True:
+            started = time.perf_counter()
+            batch = source.get()
+            metrics.wait_seconds += time.perf_counter() - started
+            if batch is _END:
+                break
+            if self._error is not None or self._cancelled.is_set():
+                continue
+            started = time.perf_counter()
+            try:
+                if self.cache is not None:
+                    for i in batch.pending:
+                        self.cache.put(self.backend.version, batch.texts[i].strip(), batch.results[i])
+                for text, translated in zip(batch.texts, batch.results):
+                    on_result(text, translated)
+            except Exception as e:
+                self._fail(e)
+                continue
+            metrics.busy_seconds += time.perf_counter() - started
+            metrics.batches += 1
+            metrics.items += len(batch.texts)
+
+    def _cache_lookup(self, batch: Batch) -> int:
+        """Заполняет переводы из кэша и отмечает фрагменты, которые нужно перевести."""
+        for i, text in enumerate(batch.texts):
+            key = text.strip()
+            if not key:
+                batch.results[i] = ""
+                continue
+            cached = self.cache.get(self.backend.version, key) if self.cache is not None else None
+            if cached is None:
+                batch.pending.append(i)
+            else:
+                batch.results[i] = cached
+        return len(batch.texts)
+
+    def _tokenize(self, batch: Batch) -> int:
+        """Токенизирует фрагменты, которых не было в кэше."""
+        if batch.pending:
+            batch.payload = self.backend.tokenize([batch.texts[i].strip() for i in batch.pending])
+        return len(batch.pending)
+
+    def _infer(self, batch: Batch) -> int:
+        """Выполняет вывод модели для токенизированных фрагментов."""
+        if batch.pending:
+            batch.payload = self.backend.generate(batch.payload)
+        return len(batch.pending)
+
+    def _decode(self, batch: Batch) -> int:
+        """Декодирует результаты вывода в переводы фрагментов."""
+        if batch.pending:
+            for i, translated in zip(batch.pending, self.backend.decode(batch.payload)):
+                batch.results[i] = translated
+            batch.payload = None
+        return len(batch.pending)
+
+    def _fail(self, error: Exception) -> None:
+        """Запоминает первую ошибку и останавливает конвейер."""
+        if self._error is None:
+            self._error = error
+        self._cancelled.set()
+
+    def report(self) -> str:
+        """Возвращает сводку по стадиям и пропускную способность относительно стадии вывода."""
+        lines = [str(metrics) for metrics in self.metrics]
+        inference = self.metrics[self.STAGES.index("inference")]
+        if self.wall_seconds:
+            # Близко к 100%, когда остальные стадии полностью перекрываются с выводом модели
+            lines.append(
+                f"Общее время {self.wall_seconds:.3f} с, из них вывод модели "
+                f"{inference.busy_seconds / self.wall_seconds:.0%}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,82 @@
+import os
+
+from PyQt5.QtGui import QColor, QPalette
+from PyQt5.QtWidgets import QApplication
+
+from config import Config
+
+
+# Цветовая палитра приложения (совпадает со справкой в styles.qss)
+PRIMARY_COLOR = QColor("#5C4033")
+HOVER_COLOR = QColor("#4A352B")
+ACCENT_ONE_COLOR = QColor("#E9B077")
+ACCENT_TWO_COLOR = QColor("#87CEEB")
+LIGHT_BACKGROUND = QColor(255, 255, 255, 77)
+LIGHT_HOVER = QColor(255, 255, 255, 102)
+
+# Кэш прочитанных стилей: путь -> (время изменения файла, текст)
+_stylesheet_cache = {}
+
+
+def validate_stylesheet(stylesheet: str) -> None:
+    """Проверяет парность комментариев и фигурных скобок в таблице стилей."""
+    depth = 0
+    line = 1
+    i = 0
+    while i < len(stylesheet):
+        char = stylesheet[i]
+        if stylesheet.startswith("/*", i):
+            end = stylesheet.find("*/", i + 2)
+            if end == -1:
+                raise ValueError(f"Незакрытый комментарий в styles.qss (строка {line})")
+            line += stylesheet.count("\n", i, end)
+            i = end + 2
+            continue
+        if char == "\n":
+            line += 1
+        elif char == "{":
+            depth += 1
+            if depth > 1:
+                raise ValueError(f"Вложенный блок правил в styles.qss (строка {line})")
+        elif char == "}":
+            depth -= 1
+            if depth < 0:
+                raise ValueError(f"Лишняя закрывающая скобка в styles.qss (строка {line})")
+        i += 1
+    if depth != 0:
+        raise ValueError("Незакрытый блок правил в конце styles.qss")
+
+
+def load_stylesheet(path: str = Config.STYLESHEET_PATH) -> str:
+    """Загружает и проверяет таблицу стилей, повторно читая файл только после его изменения."""
+    mtime = os.path.getmtime(path)
+    cached = _stylesheet_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        stylesheet = f.read()
+    validate_stylesheet(stylesheet)
+    _stylesheet_cache[path] = (mtime, stylesheet)
+    return stylesheet
+
+
+def build_palette(base: QPalette) -> QPalette:
+    """Возвращает палитру с цветами приложения для статических элементов."""
+    palette = QPalette(base)
+    for role in (QPalette.WindowText, QPalette.Text, QPalette.ButtonText):
+        palette.setColor(role, PRIMARY_COLOR)
+    palette.setColor(QPalette.Highlight, ACCENT_ONE_COLOR)
+    palette.setColor(QPalette.HighlightedText, PRIMARY_COLOR)
+    return palette
+
+
+def apply_theme(application: QApplication) -> None:
+    """Применяет палитру и таблицу стилей на уровне приложения один раз."""
+    stylesheet = load_stylesheet()
+    # Повторная установка того же текста заставила бы Qt заново разобрать стили всех виджетов
+    if application.property("themeStylesheet") == stylesheet:
+        return
+    application.setPalette(build_palette(application.palette()))
+    application.setStyleSheet(stylesheet)
+    application.setProperty("themeStylesheet", stylesheet)
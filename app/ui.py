@@ -1,15 +1,44 @@
 import os
 
 from PyQt5.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-    QTextEdit, QLabel, QGridLayout, QScrollArea, QFrame)
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+    QTextEdit, QLabel, QGridLayout, QScrollArea, QFrame, QProgressBar)
 
-from PyQt5.QtGui import QPixmap, QPalette, QBrush, QPainter, QIcon, QMouseEvent, QResizeEvent
+from PyQt5.QtGui import (
+    QPixmap, QPalette, QBrush, QPainter, QIcon, QMouseEvent, QResizeEvent, QPaintEvent,
+    QTextCursor, QCloseEvent)
 from PyQt5.QtSvg import QSvgRenderer
-from PyQt5.QtCore import Qt, QPoint, QEvent
+from PyQt5.QtCore import Qt, QPoint, QEvent, QMimeData, pyqtSignal
 
 from logic import TranslatorLogic
 from config import Config
+from theme import LIGHT_BACKGROUND, LIGHT_HOVER
+
+
+class InputTextEdit(QTextEdit):
+    """Класс для текстового поля ввода, передающего большие вставки в массовый перевод."""
+
+    bulk_text_received = pyqtSignal(str)
+    files_dropped = pyqtSignal(list)
+
+    def canInsertFromMimeData(self, source: QMimeData) -> bool:
+        """Разрешает перетаскивание файлов в поле ввода."""
+        return source.hasUrls() or super().canInsertFromMimeData(source)
+
+    def insertFromMimeData(self, source: QMimeData) -> None:
+        """Вставляет текст, а большой текст или перетащенные файлы отдаёт на массовый перевод."""
+        if source.hasUrls():
+            # Файлы читаются в фоновом потоке массового перевода
+            paths = [url.toLocalFile() for url in source.urls() if url.isLocalFile()]
+            if paths:
+                self.files_dropped.emit(paths)
+                return
+
+        text = source.text()
+        if len(text) > Config.BULK_INPUT_THRESHOLD:
+            self.bulk_text_received.emit(text)
+        else:
+            super().insertFromMimeData(source)
 
 
 class OutputTextEdit(QTextEdit):
@@ -39,6 +68,12 @@ class OutputTextEdit(QTextEdit):
         else:
             self.setViewportMargins(0, 0, 0, 0)
 
+    def appendChunk(self, text: str) -> None:
+        """Дописывает фрагмент перевода в конец документа, не заменяя весь текст."""
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+
     def resizeEvent(self, event: QResizeEvent) -> None:
         """Обновляет позицию контейнера копирования при изменении размера."""
         super().resizeEvent(event)
@@ -63,6 +98,37 @@ class OutputTextEdit(QTextEdit):
                 self.copy_container.raise_()
 
 
+class HistoryCard(QWidget):
+    """Класс карточки истории, которая рисует свой фон сама, без правил таблицы стилей."""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.hovered = False
+        self.entry = None
+        self.setFixedWidth(Config.HISTORY_CARD_WIDTH)
+
+    def enterEvent(self, event: QEvent) -> None:
+        """Подсвечивает карточку при наведении."""
+        self.hovered = True
+        self.update()
+        super().enterEvent(event)
+
+    def leaveEvent(self, event: QEvent) -> None:
+        """Снимает подсветку карточки."""
+        self.hovered = False
+        self.update()
+        super().leaveEvent(event)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """Рисует полупрозрачный фон карточки со скруглёнными углами."""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(LIGHT_HOVER if self.hovered else LIGHT_BACKGROUND)
+        painter.drawRoundedRect(self.rect(), 10, 10)
+        painter.end()
+
+
 class SymbolsPopup(QWidget):
     """Класс для всплывающего окна со специальными символами."""
 
@@ -150,7 +216,6 @@ class TranslatorApp(QMainWindow):
         self.logic = TranslatorLogic(self)
         self.symbols_popup = SymbolsPopup(self)
         self.about_widget = None
-        self.apply_styles() 
         self.setup_ui()
 
     def setup_ui(self) -> None:
@@ -255,9 +320,11 @@ class TranslatorApp(QMainWindow):
         grid_layout.addWidget(self.output_label, 0, 2, 1, 1, Qt.AlignCenter)
 
         # Поле ввода текста
-        self.input_field = QTextEdit()
+        self.input_field = InputTextEdit()
         self.input_field.setPlaceholderText("Введите текст для перевода")
         self.input_field.textChanged.connect(self.logic.on_input_text_changed)
+        self.input_field.bulk_text_received.connect(self.logic.load_bulk_text)
+        self.input_field.files_dropped.connect(self.logic.load_bulk_files)
         grid_layout.addWidget(self.input_field, 1, 0, 1, 1)
 
         # Контейнер для поля вывода
@@ -330,6 +397,25 @@ class TranslatorApp(QMainWindow):
 
         button_layout.addStretch(5)
 
+        # Индикатор прогресса и кнопка отмены массового перевода
+        self.bulk_widget = QWidget()
+        bulk_layout = QHBoxLayout(self.bulk_widget)
+        bulk_layout.setContentsMargins(0, 5, 0, 0)
+        bulk_layout.setSpacing(10)
+
+        self.bulk_progress = QProgressBar()
+        self.bulk_progress.setObjectName("bulkProgress")
+        self.bulk_progress.setTextVisible(False)
+        bulk_layout.addWidget(self.bulk_progress)
+
+        self.cancel_button = QPushButton("Отменить")
+        self.cancel_button.setObjectName("cancelButton")
+        self.cancel_button.clicked.connect(self.logic.cancel_bulk_translation)
+        bulk_layout.addWidget(self.cancel_button)
+
+        self.bulk_widget.hide()
+        content_layout.addWidget(self.bulk_widget)
+
         # Устанавливаем одинаковую ширину для кнопок с учётом стилей
         translate_width = self.translate_button.sizeHint().width()
         clear_width = self.clear_button.sizeHint().width()
@@ -390,6 +476,10 @@ class TranslatorApp(QMainWindow):
         self.content_widget.hide()
         self.about_widget.show()
 
+    def create_history_card(self) -> HistoryCard:
+        """Создаёт пустую карточку истории переводов."""
+        return HistoryCard(self.history_container)
+
     def load_icon(self, normal_svg: str, hover_svg: str, size: tuple [int, int]) -> None:
         """Загружает иконки для кнопок (обычное и при наведении)."""
         normal_pixmap = QPixmap(size)
@@ -413,12 +503,6 @@ class TranslatorApp(QMainWindow):
         palette.setBrush(QPalette.Background, QBrush(pixmap))
         self.setPalette(palette)
 
-    def apply_styles(self) -> None:
-        """Применяет стили из файла styles.qss."""
-        full_path = os.path.abspath(Config.STYLESHEET_PATH)
-        with open(Config.STYLESHEET_PATH, "r") as f:
-            self.setStyleSheet(f.read())
-
     def showEvent(self, event: QEvent) -> None:
         """Обрабатывает событие отображения окна."""
         self.output_field.updateCopyContainerPosition()
@@ -431,6 +515,11 @@ class TranslatorApp(QMainWindow):
         self.error_label.setGeometry(0, 0, self.output_field.width(), self.output_field.height())
         super().resizeEvent(event)
 
+    def closeEvent(self, event: QCloseEvent) -> None:
+        """Останавливает фоновый перевод перед закрытием окна."""
+        self.logic.stop_bulk_translation()
+        super().closeEvent(event)
+
     def mousePressEvent(self, event: QMouseEvent) -> None:
         """Обрабатывает нажатие мыши."""
         self.logic.mousePressEvent(event)
@@ -0,0 +1,86 @@
+"""Замер памяти, занимаемой записями истории переводов в разных представлениях.
+
+Сравнивает прежние словари с названиями языков, записи HistoryRecord и столбцовое
+хранилище HistoryLog на одном и том же наборе записей.
+
+Пример запуска:
+    python benchmarks/bench_history_memory.py --entries 1000000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from history import HistoryLog, HistoryRecord  # noqa: E402
+
+
+def make_texts(index: int) -> tuple[str, str]:
+    """Возвращает пару коротких текстов, похожих на реальные записи истории."""
+    return f"Где большой дом {index}?", f"qana-ẍ angali-ẍ ula-ẍ {index}"
+
+
+def measure(build) -> int:
+    """Возвращает объём памяти (в байтах), удерживаемый результатом build()."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def build_dicts(count: int) -> list:
+    """Прежнее представление: словарь с четырьмя ключами и названиями языков."""
+    return [
+        {
+            "source_lang": "Русский",
+            "input_text": source,
+            "target_lang": "Алеутский",
+            "translated_text": target,
+        }
+        for source, target in map(make_texts, range(count))
+    ]
+
+
+def build_records(count: int) -> list:
+    """Записи HistoryRecord с кодами языков."""
+    return [
+        HistoryRecord.create("Русский", source, "Алеутский", target)
+        for source, target in map(make_texts, range(count))
+    ]
+
+
+def build_log(count: int) -> HistoryLog:
+    """Столбцовое хранилище HistoryLog."""
+    log = HistoryLog()
+    for source, target in map(make_texts, range(count)):
+        log.append(HistoryRecord.create("Русский", source, "Алеутский", target))
+    return log
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Замер памяти записей истории переводов")
+    parser.add_argument("--entries", type=int, default=1_000_000, help="Число записей")
+    args = parser.parse_args()
+
+    baseline = None
+    for name, build in (
+        ("dict", build_dicts),
+        ("HistoryRecord", build_records),
+        ("HistoryLog", build_log),
+    ):
+        size = measure(lambda: build(args.entries))
+        baseline = baseline or size
+        print(
+            f"{name:>14}: {size / 2 ** 20:8.1f} МБ, {size / args.entries:6.1f} байт на запись, "
+            f"{size / baseline:5.1%} от словарей"
+        )
+
+
+if __name__ == "__main__":
+    main()
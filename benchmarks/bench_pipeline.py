@@ -0,0 +1,139 @@
+"""Замер пропускной способности конвейера перевода по сравнению с последовательной обработкой.
+
+Вместо модели используется имитация с фиксированным временем токенизации, вывода
+и декодирования пакета, поэтому скрипт не требует ни модели, ни сети. Текст делится
+на предложения так же, как для модели в приложении.
+
+Режим --mode sleep ждёт в time.sleep, который отпускает GIL, поэтому стадии
+перекрываются полностью и ускорение получается верхней оценкой. Режим --mode cpu
+занимает процессор циклом на чистом Python, который держит GIL, и даёт нижнюю
+оценку. Настоящая модель находится между ними: torch отпускает GIL во время вывода.
+
+Пример запуска:
+    python benchmarks/bench_pipeline.py --sentences 2000 --inference-ms 40 --mode cpu
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from pipeline import TranslationPipeline, split_into_sentences  # noqa: E402
+
+
+def busy_loop(iterations: int) -> None:
+    """Выполняет заданное число итераций цикла на чистом Python, не отпуская GIL надолго."""
+    total = 0
+    for i in range(iterations):
+        total += i
+
+
+def calibrate_busy_loop() -> float:
+    """Возвращает число итераций busy_loop в секунду в одном потоке (лучшее из нескольких замеров)."""
+    iterations = 500_000
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        busy_loop(iterations)
+        best = min(best, time.perf_counter() - started)
+    return iterations / best
+
+
+class SimulatedBackend:
+    """Имитация движка перевода с заданным временем каждой стадии на пакет.
+
+    В режиме "sleep" стадия ждёт, отпустив GIL, в режиме "cpu" — крутит цикл, удерживая его.
+    """
+
+    version = "simulated"
+
+    def __init__(
+        self, tokenize_ms: float, inference_ms: float, decode_ms: float, mode: str = "sleep"
+    ) -> None:
+        self.tokenize_seconds = tokenize_ms / 1000
+        self.inference_seconds = inference_ms / 1000
+        self.decode_seconds = decode_ms / 1000
+        self.mode = mode
+        self.iterations_per_second = calibrate_busy_loop() if mode == "cpu" else 0
+
+    def work(self, seconds: float) -> None:
+        """Имитирует работу стадии длительностью seconds."""
+        if self.mode == "sleep":
+            time.sleep(seconds)
+            return
+        # Фиксированный объём работы, а не срок: ожидание GIL не засчитывается в работу
+        busy_loop(int(seconds * self.iterations_per_second))
+
+    def tokenize(self, texts: list[str]) -> list[str]:
+        self.work(self.tokenize_seconds)
+        return texts
+
+    def generate(self, texts: list[str]) -> list[str]:
+        self.work(self.inference_seconds)
+        return [text.upper() for text in texts]
+
+    def decode(self, texts: list[str]) -> list[str]:
+        self.work(self.decode_seconds)
+        return texts
+
+    def translate_batch(self, texts: list[str]) -> list[str]:
+        return self.decode(self.generate(self.tokenize(texts)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Замер пропускной способности конвейера перевода")
+    parser.add_argument("--sentences", type=int, default=2000, help="Число предложений в тексте")
+    parser.add_argument("--segment-size", type=int, default=300, help="Наибольшая длина фрагмента")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=2)
+    parser.add_argument("--tokenize-ms", type=float, default=15)
+    parser.add_argument("--inference-ms", type=float, default=40)
+    parser.add_argument("--decode-ms", type=float, default=10)
+    parser.add_argument(
+        "--mode",
+        choices=("sleep", "cpu"),
+        default="cpu",
+        help="sleep — стадии отпускают GIL (верхняя оценка), cpu — удерживают его (нижняя)",
+    )
+    args = parser.parse_args()
+
+    backend = SimulatedBackend(args.tokenize_ms, args.inference_ms, args.decode_ms, args.mode)
+    text = "".join(f"Предложение номер {i}. " for i in range(args.sentences))
+    segments = list(split_into_sentences(text, args.segment_size))
+
+    # Последовательная обработка: стадии каждого пакета идут друг за другом
+    started = time.perf_counter()
+    for start in range(0, len(segments), args.batch_size):
+        backend.translate_batch(segments[start:start + args.batch_size])
+    sequential_seconds = time.perf_counter() - started
+
+    pipeline = TranslationPipeline(
+        backend,
+        segment_size=args.segment_size,
+        sentences=True,
+        batch_size=args.batch_size,
+        queue_size=args.queue_size,
+    )
+    results = []
+    pipeline.run(text, lambda chunk, translated: results.append(translated))
+
+    print(pipeline.report())
+    # Время стадий в отчёте — настенное и в режиме cpu включает ожидание GIL,
+    # поэтому долю вывода считаем и по заданному времени вывода пакета
+    batches = pipeline.metrics[pipeline.STAGES.index("inference")].batches
+    inference_seconds = batches * backend.inference_seconds
+    print(
+        f"Чистое время вывода модели {inference_seconds:.3f} с "
+        f"({inference_seconds / pipeline.wall_seconds:.0%} общего)"
+    )
+    print(f"Фрагментов переведено: {len(results)}")
+    print(
+        f"Последовательно: {sequential_seconds:.3f} с, конвейер: {pipeline.wall_seconds:.3f} с, "
+        f"ускорение {sequential_seconds / pipeline.wall_seconds:.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Замер времени полировки (применения стилей) карточек истории переводов.
+
+Сравнивает прежнюю схему (таблица стилей на уровне окна, перестройка всех карточек
+после каждого перевода) с текущей (стили на уровне приложения, одна новая карточка).
+Прежняя схема замеряется с текущим styles.qss, к которому добавлены удалённые
+из него правила #historyCard и цвета текста, перенесённые в палитру.
+
+Пример запуска:
+    python benchmarks/bench_polish.py --cards 200
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from PyQt5.QtCore import Qt  # noqa: E402
+from PyQt5.QtGui import QFont, QFontMetrics  # noqa: E402
+from PyQt5.QtWidgets import QApplication, QLabel, QMainWindow, QVBoxLayout, QWidget  # noqa: E402
+
+from config import Config  # noqa: E402
+from theme import apply_theme, load_stylesheet  # noqa: E402
+
+# Правила, которые были в styles.qss до отрисовки фона в HistoryCard и переноса
+# основного цвета текста в палитру приложения
+LEGACY_RULES = """
+QLabel,
+QPushButton#menuButton,
+QTextEdit,
+QLabel#copyTooltip,
+QLabel#errorLabel,
+QLabel#historyLangLabel,
+QLabel#historyTextLabel,
+QLabel#aboutTitle,
+QLabel#aboutText {
+    color: #5C4033;
+}
+
+QWidget#historyCard {
+    background-color: rgba(255, 255, 255, 0.3);
+    border: none;
+    border-radius: 10px;
+    max-width: 150px;
+    min-width: 150px;
+    padding: 5px;
+}
+
+QWidget#historyCard:hover {
+    background-color: rgba(255, 255, 255, 0.4);
+}
+"""
+
+ENTRY = {
+    "source_lang": "Русский",
+    "input_text": "Где большой дом?",
+    "target_lang": "Алеутский",
+    "translated_text": "qana-ẍ angali-ẍ ula-ẍ a-ku-ẍ",
+}
+
+
+def measure_polish_time(factory: Callable[[], QWidget], count: int) -> float:
+    """Возвращает среднее время полировки (в мс) одного виджета, созданного фабрикой."""
+    total = 0.0
+    widgets = 0
+    for _ in range(count):
+        widget = factory()
+        children = [widget] + widget.findChildren(QWidget)
+        started = time.perf_counter()
+        for child in children:
+            child.ensurePolished()
+        total += time.perf_counter() - started
+        widgets += len(children)
+        widget.deleteLater()
+    return total * 1000 / widgets if widgets else 0.0
+
+
+def legacy_card(parent: QWidget) -> QWidget:
+    """Создаёт карточку так, как это делала прежняя версия update_history."""
+    card = QWidget(parent)
+    card.setObjectName("historyCard")
+    layout = QVBoxLayout(card)
+    layout.setSpacing(2)
+    layout.setContentsMargins(10, 5, 10, 5)
+
+    # Прежде шрифты создавались заново для каждой карточки
+    font = QFont("Arial", 14)
+    font_bold = QFont("Arial", 14, QFont.Bold)
+    font_metrics = QFontMetrics(font)
+    for key, name, label_font in (
+        ("source_lang", "historyLangLabel", font_bold),
+        ("input_text", "historyTextLabel", font),
+        ("target_lang", "historyLangLabel", font_bold),
+        ("translated_text", "historyTextLabel", font),
+    ):
+        label = QLabel(ENTRY[key])
+        label.setObjectName(name)
+        label.setFont(label_font)
+        if name == "historyTextLabel":
+            label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+            label.setText(
+                font_metrics.elidedText(ENTRY[key], Qt.ElideRight, Config.HISTORY_CARD_WIDTH + 35)
+            )
+        label.setFixedHeight(font_metrics.boundingRect(ENTRY[key]).height())
+        label.setFixedWidth(Config.HISTORY_CARD_WIDTH - 20)
+        layout.addWidget(label)
+    card.setFixedHeight(Config.HISTORY_CARD_HEIGHT)
+    return card
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Замер времени полировки карточек истории")
+    parser.add_argument("--cards", type=int, default=200, help="Число создаваемых карточек")
+    args = parser.parse_args()
+
+    application = QApplication(sys.argv)
+
+    # Прежняя схема: стили окна вместе с прежними правилами применяются через setStyleSheet окна
+    legacy_window = QMainWindow()
+    legacy_window.setStyleSheet(load_stylesheet() + LEGACY_RULES)
+    legacy_ms = measure_polish_time(lambda: legacy_card(legacy_window), args.cards)
+    legacy_window.deleteLater()
+    application.processEvents()
+
+    # Текущая схема: стили приложения, карточка с собственной отрисовкой фона
+    from history import HistoryRecord
+    from ui import TranslatorApp
+
+    apply_theme(application)
+    window = TranslatorApp()
+    record = HistoryRecord.create(
+        ENTRY["source_lang"], ENTRY["input_text"], ENTRY["target_lang"], ENTRY["translated_text"]
+    )
+    current_ms = measure_polish_time(
+        lambda: window.logic.create_history_card(record), args.cards
+    )
+
+    print(f"Полировка одного виджета, было:  {legacy_ms:.4f} мс")
+    print(f"Полировка одного виджета, стало: {current_ms:.4f} мс")
+    # Раньше после каждого перевода пересоздавались все карточки истории (5 виджетов в каждой)
+    print(f"На один перевод, было:  {legacy_ms * 5 * Config.HISTORY_LIMIT:.3f} мс")
+    print(f"На один перевод, стало: {current_ms * 5:.3f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Дистилляция обученной модели в компактную модель-ученика с неглубоким декодером.
+
+Учитель (полная модель MarianMT) переводит русские фразы из обучающей выборки и
+дополнительного одноязычного корпуса; ученик с тем же энкодером и 1–2 слоями
+декодера обучается на этих переводах (дистилляция на уровне последовательностей)
+вместе с исходными парами. В конце учитель и ученик оцениваются на отложенной
+выборке, и отчёты сохраняются так же, как в eval_model.py.
+
+Пример запуска:
+    python distill.py --teacher ../app/models/Marian_aleut_model --cache dataset_cache \
+        --monolingual russian_monolingual.txt --output ../app/models/Marian_aleut_student
+"""
+
+import argparse
+import json
+import os
+from functools import partial
+
+import torch
+from datasets import Dataset, concatenate_datasets
+from transformers import MarianConfig, MarianMTModel, Trainer, TrainingArguments
+
+# eval_model добавляет папку приложения в sys.path, поэтому импортируется до engine
+from eval_model import evaluate, save_report
+from engine import MarianEngine, model_version
+from preprocess import load_prepared_dataset, normalize_text, tokenize_batch
+
+
+def load_monolingual(file_path: str) -> Dataset:
+    """Загружает одноязычный русский корпус (одна фраза на строку) без дубликатов."""
+    def iter_lines():
+        seen = set()
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                text = normalize_text(line)
+                if text and text not in seen:
+                    seen.add(text)
+                    yield {"source": text}
+
+    return Dataset.from_generator(iter_lines)
+
+
+def translate_with_teacher(teacher: MarianEngine, sources: Dataset, batch_size: int) -> Dataset:
+    """Добавляет к набору русских фраз переводы учителя в столбец target."""
+    return sources.map(
+        lambda batch: {"target": teacher.translate_batch(batch["source"])},
+        batched=True,
+        batch_size=batch_size,
+        load_from_cache_file=False,
+    )
+
+
+def build_student(teacher: MarianMTModel, decoder_layers: int) -> MarianMTModel:
+    """Создаёт ученика с энкодером учителя и первыми decoder_layers слоями его декодера."""
+    config = MarianConfig.from_dict({**teacher.config.to_dict(), "decoder_layers": decoder_layers})
+    student = MarianMTModel(config)
+
+    # Совпадающие по именам веса (эмбеддинги, энкодер, первые слои декодера) копируются,
+    # лишние слои декодера учителя пропускаются
+    student.load_state_dict(teacher.state_dict(), strict=False)
+    return student
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Дистилляция модели перевода в модель-ученика")
+    parser.add_argument("--teacher", required=True, help="Путь к папке с моделью-учителем")
+    parser.add_argument("--cache", required=True, help="Папка с датасетом, подготовленным preprocess.py")
+    parser.add_argument("--monolingual", help="Файл с русскими фразами, по одной на строку")
+    parser.add_argument("--output", required=True, help="Папка для сохранения модели-ученика")
+    parser.add_argument("--decoder-layers", type=int, default=1)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--teacher-beams", type=int, default=5)
+    parser.add_argument("--student-beams", type=int, default=1)
+    parser.add_argument("--num-proc", type=int, default=None)
+    args = parser.parse_args()
+
+    prepared = load_prepared_dataset(args.cache)
+    train_pairs = prepared["train"].select_columns(["source", "target"])
+    test_split = prepared["test"]
+
+    # Учитель переводит обучающие и одноязычные фразы
+    teacher_version = model_version(args.teacher)
+    teacher = MarianEngine(args.teacher, teacher_version, num_beams=args.teacher_beams)
+    sources = train_pairs.select_columns(["source"])
+    if args.monolingual:
+        sources = concatenate_datasets([sources, load_monolingual(args.monolingual)])
+    distilled_pairs = translate_with_teacher(teacher, sources, args.batch_size)
+
+    # Токенизатор и веса учителя уже загружены движком и переиспользуются
+    tokenizer = teacher.tokenizer
+    train_dataset = concatenate_datasets([distilled_pairs, train_pairs]).shuffle(seed=42)
+    train_dataset = train_dataset.map(
+        partial(tokenize_batch, tokenizer=tokenizer),
+        batched=True,
+        num_proc=args.num_proc,
+    )
+    eval_dataset = test_split.map(partial(tokenize_batch, tokenizer=tokenizer), batched=True)
+
+    student = build_student(teacher.model, args.decoder_layers)
+    training_args = TrainingArguments(
+        output_dir="./marian_aleut_student",
+        evaluation_strategy="epoch",
+        learning_rate=3e-4,
+        per_device_train_batch_size=args.batch_size,
+        per_device_eval_batch_size=args.batch_size,
+        num_train_epochs=args.epochs,
+        weight_decay=0.01,
+        save_strategy="epoch",
+        load_best_model_at_end=True,
+        logging_steps=10,
+        report_to="none",
+        fp16=torch.cuda.is_available(),
+    )
+    trainer = Trainer(
+        model=student,
+        args=training_args,
+        train_dataset=train_dataset,
+        eval_dataset=eval_dataset,
+    )
+    trainer.train()
+
+    # Сохраняем ученика; distill.json отмечает его как модель для интерактивных запросов
+    trainer.model.save_pretrained(args.output)
+    tokenizer.save_pretrained(args.output)
+    with open(os.path.join(args.output, "distill.json"), "w", encoding="utf-8") as f:
+        json.dump(
+            {"role": "student", "teacher": teacher_version, "decoder_layers": args.decoder_layers},
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+    # Сравниваем качество и задержку учителя и ученика на отложенной выборке.
+    # Учитель оценивается и с числом лучей ученика, чтобы отделить выигрыш
+    # от неглубокого декодера от выигрыша от более узкого поиска
+    student_version = model_version(args.output)
+    student_engine = MarianEngine(args.output, student_version, num_beams=args.student_beams)
+    results = {}
+    for role, engine, beams in (
+        ("teacher", teacher, args.teacher_beams),
+        ("teacher_student_beams", teacher, args.student_beams),
+        ("student", student_engine, args.student_beams),
+    ):
+        engine.num_beams = beams
+        report = evaluate(engine, test_split["source"], test_split["target"], batch_size=args.batch_size)
+        report["version"] = engine.version
+        report["settings"] = {
+            "num_beams": beams,
+            "quantize": False,
+            "batch_size": args.batch_size,
+            "device": str(engine.device),
+        }
+        save_report(report, engine.version)
+        results[role] = report
+
+    student_report = results["student"]
+    for role, title in (
+        ("teacher", f"Учитель ({args.teacher_beams} лучей)"),
+        ("teacher_student_beams", f"Учитель ({args.student_beams} лучей)"),
+        ("student", f"Ученик ({args.student_beams} лучей)"),
+    ):
+        report = results[role]
+        print(f"{title}: BLEU {report['bleu']:.2f}, chrF {report['chrf']:.2f}, "
+              f"задержка {report['latency_ms']['mean']:.1f} мс")
+    for role, title in (
+        ("teacher", "Относительно учителя с его числом лучей"),
+        ("teacher_student_beams", "Относительно учителя с тем же числом лучей (вклад неглубокого декодера)"),
+    ):
+        report = results[role]
+        print(f"{title}: потеря BLEU {report['bleu'] - student_report['bleu']:.2f}, "
+              f"ускорение {report['latency_ms']['mean'] / student_report['latency_ms']['mean']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Офлайн-оценка модели перевода на отложенной выборке.
+
+Модуль не называется evaluate.py, чтобы не перекрывать пакет evaluate от Hugging Face
+при запуске скриптов из этой папки.
+
+Пример запуска:
+    python eval_model.py --model ../app/models/Marian_aleut_model --dataset russian_aleut_dataset.csv
+    python eval_model.py --model ../app/models/Marian_aleut_model --dataset russian_aleut_dataset.csv --greedy --quantize
+    python eval_model.py --model ../app/models/Marian_aleut_model --cache dataset_cache
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+from datasets import Dataset, load_from_disk
+
+# Используем тот же пакетный путь перевода, что и приложение
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+from engine import MarianEngine, model_version  # noqa: E402
+from preprocess import load_clean_pairs, split_pairs  # noqa: E402
+
+REPORTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+
+
+def ngram_counts(tokens: list, n: int) -> Counter:
+    """Подсчитывает n-граммы последовательности одним проходом по сдвинутым срезам."""
+    return Counter(zip(*(tokens[i:] for i in range(n))))
+
+
+def corpus_bleu(hypotheses: list[str], references: list[str], max_order: int = 4) -> float:
+    """Вычисляет корпусный BLEU (0–100) по словам с штрафом за краткость."""
+    matches = [0] * max_order
+    totals = [0] * max_order
+    hyp_length = ref_length = 0
+
+    for hypothesis, reference in zip(hypotheses, references):
+        hyp_tokens = hypothesis.split()
+        ref_tokens = reference.split()
+        hyp_length += len(hyp_tokens)
+        ref_length += len(ref_tokens)
+        for n in range(1, max_order + 1):
+            hyp_ngrams = ngram_counts(hyp_tokens, n)
+            # Пересечение счётчиков даёт усечённые совпадения n-грамм
+            matches[n - 1] += sum((hyp_ngrams & ngram_counts(ref_tokens, n)).values())
+            totals[n - 1] += max(len(hyp_tokens) - n + 1, 0)
+
+    if hyp_length == 0 or min(matches) == 0:
+        return 0.0
+    log_precision = sum(math.log(m / t) for m, t in zip(matches, totals)) / max_order
+    brevity_penalty = 1.0 if hyp_length > ref_length else math.exp(1 - ref_length / hyp_length)
+    return 100 * brevity_penalty * math.exp(log_precision)
+
+
+def corpus_chrf(
+    hypotheses: list[str], references: list[str], max_order: int = 6, beta: float = 2.0
+) -> float:
+    """Вычисляет корпусный chrF (0–100) по символьным n-граммам без пробелов."""
+    matches = [0] * max_order
+    hyp_totals = [0] * max_order
+    ref_totals = [0] * max_order
+
+    for hypothesis, reference in zip(hypotheses, references):
+        hyp_chars = list(hypothesis.replace(" ", ""))
+        ref_chars = list(reference.replace(" ", ""))
+        for n in range(1, max_order + 1):
+            hyp_ngrams = ngram_counts(hyp_chars, n)
+            ref_ngrams = ngram_counts(ref_chars, n)
+            matches[n - 1] += sum((hyp_ngrams & ref_ngrams).values())
+            hyp_totals[n - 1] += max(len(hyp_chars) - n + 1, 0)
+            ref_totals[n - 1] += max(len(ref_chars) - n + 1, 0)
+
+    precisions = [m / t for m, t in zip(matches, hyp_totals) if t]
+    recalls = [m / t for m, t in zip(matches, ref_totals) if t]
+    if not precisions or not recalls:
+        return 0.0
+    precision = sum(precisions) / len(precisions)
+    recall = sum(recalls) / len(recalls)
+    if precision + recall == 0:
+        return 0.0
+    beta_sq = beta ** 2
+    return 100 * (1 + beta_sq) * precision * recall / (beta_sq * precision + recall)
+
+
+def load_eval_split(file_path: str) -> Dataset:
+    """Возвращает тестовую выборку CSV-файла после той же очистки и разбиения, что и при обучении.
+
+    Пары нормализуются и дедуплицируются функциями preprocess.py, поэтому в тестовую
+    выборку не попадают строки, на которых обучалась модель.
+    """
+    return split_pairs(load_clean_pairs(file_path))["test"]
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Возвращает перцентиль списка значений (ближайший ранг)."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def evaluate(
+    engine: MarianEngine,
+    sources: list[str],
+    references: list[str],
+    batch_size: int,
+    latency_sentences: int = 100,
+) -> dict:
+    """Переводит выборку пакетами и возвращает метрики качества, пропускной способности и задержки.
+
+    Задержка измеряется отдельно: первые latency_sentences предложений переводятся
+    по одному, поэтому перцентили относятся к отдельным предложениям, а не к пакетам.
+    """
+    hypotheses = []
+    started = time.perf_counter()
+    for start in range(0, len(sources), batch_size):
+        hypotheses.extend(engine.translate_batch(sources[start:start + batch_size]))
+    total_seconds = time.perf_counter() - started
+
+    latencies_ms = []
+    for source in sources[:latency_sentences]:
+        sentence_started = time.perf_counter()
+        engine.translate_batch([source])
+        latencies_ms.append((time.perf_counter() - sentence_started) * 1000)
+
+    return {
+        "bleu": corpus_bleu(hypotheses, references),
+        "chrf": corpus_chrf(hypotheses, references),
+        "sentences": len(sources),
+        "throughput": {
+            "batch_size": batch_size,
+            "total_seconds": total_seconds,
+            "sentences_per_second": len(sources) / total_seconds if total_seconds else 0.0,
+        },
+        "latency_ms": {
+            "sentences": len(latencies_ms),
+            "mean": sum(latencies_ms) / len(latencies_ms) if latencies_ms else 0.0,
+            "p50": percentile(latencies_ms, 0.5) if latencies_ms else 0.0,
+            "p95": percentile(latencies_ms, 0.95) if latencies_ms else 0.0,
+        },
+        "samples": [
+            {"source": s, "reference": r, "hypothesis": h}
+            for s, r, h in list(zip(sources, references, hypotheses))[:20]
+        ],
+    }
+
+
+def save_report(report: dict, version: str, reports_path: str = REPORTS_PATH) -> str:
+    """Сохраняет отчёт в папку версии модели и возвращает путь к файлу."""
+    version_dir = os.path.join(reports_path, version)
+    os.makedirs(version_dir, exist_ok=True)
+    settings = report["settings"]
+    name = "{}_beams{}{}.json".format(
+        datetime.now().strftime("%Y%m%d_%H%M%S"),
+        settings["num_beams"],
+        "_int8" if settings["quantize"] else "",
+    )
+    report_path = os.path.join(version_dir, name)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Оценка модели перевода на отложенной выборке")
+    parser.add_argument("--model", required=True, help="Путь к папке с моделью")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dataset", help="Путь к CSV-файлу с парами переводов")
+    source.add_argument("--cache", help="Папка с датасетом, подготовленным preprocess.py")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--latency-sentences", type=int, default=100,
+                        help="Число предложений для замера задержки по одному")
+    parser.add_argument("--num-beams", type=int, default=5)
+    parser.add_argument("--greedy", action="store_true", help="Жадное декодирование (num_beams=1)")
+    parser.add_argument("--quantize", action="store_true", help="Динамическое квантование int8")
+    args = parser.parse_args()
+
+    num_beams = 1 if args.greedy else args.num_beams
+    # Та же версия, что показывает приложение: имя папки и время изменения файлов модели
+    version = model_version(args.model)
+    if args.cache:
+        # Тестовая выборка из общего с обучением кэша, без повторной предобработки
+        eval_dataset = load_from_disk(args.cache)["test"]
+    else:
+        eval_dataset = load_eval_split(args.dataset)
+    engine = MarianEngine(args.model, version, num_beams=num_beams, quantize=args.quantize)
+
+    report = evaluate(
+        engine,
+        eval_dataset["source"],
+        eval_dataset["target"],
+        args.batch_size,
+        args.latency_sentences,
+    )
+    report["version"] = version
+    report["settings"] = {
+        "num_beams": num_beams,
+        "quantize": args.quantize,
+        "batch_size": args.batch_size,
+        "device": str(engine.device),
+    }
+    report_path = save_report(report, version)
+
+    print(f"BLEU: {report['bleu']:.2f}  chrF: {report['chrf']:.2f}")
+    print(f"Пропускная способность: {report['throughput']['sentences_per_second']:.1f} предложений/с "
+          f"(пакеты по {args.batch_size})")
+    print(f"Задержка на предложение: {report['latency_ms']['mean']:.1f} мс (p95 {report['latency_ms']['p95']:.1f} мс)")
+    print(f"Отчёт сохранён: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
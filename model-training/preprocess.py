@@ -0,0 +1,207 @@
+"""Предобработка датасета: нормализация, дедупликация, фильтрация и токенизация.
+
+Результат сохраняется на диск в формате Arrow (DatasetDict с выборками train/test)
+и открывается через отображение в память, поэтому обучение и оценка используют
+один и тот же кэш, не загружая корпус в оперативную память целиком.
+
+Пример запуска:
+    python preprocess.py --dataset russian_aleut_dataset.csv --cache-dir dataset_cache --num-proc 4
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import time
+import unicodedata
+from functools import partial
+from typing import Iterator
+
+import pandas as pd
+from datasets import Dataset, DatasetDict, load_from_disk
+from transformers import MarianTokenizer
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Параметры разбиения на train/test, общие для обучения и оценки
+TEST_SIZE = 0.1
+SPLIT_SEED = 42
+
+
+def normalize_text(text: str) -> str:
+    """Приводит текст к форме NFC и схлопывает пробельные символы."""
+    # NFC собирает "x" + комбинируемые знаки в единые символы (например, "ẍ")
+    return WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def pair_digest(source: str, target: str) -> bytes:
+    """Возвращает 8-байтный хэш пары для дедупликации без хранения самих строк."""
+    key = f"{source.casefold()}\t{target.casefold()}".encode("utf-8")
+    return hashlib.blake2b(key, digest_size=8).digest()
+
+
+def iter_clean_pairs(
+    file_path: str,
+    max_length_ratio: float = 3.0,
+    max_chars: int = 512,
+    chunksize: int = 100_000,
+    stats: dict = None,
+    file_mtime: float = None,
+) -> Iterator[dict]:
+    """Построчно читает CSV-файл и возвращает нормализованные уникальные пары.
+
+    Тексты не накапливаются в памяти, но для дедупликации хранится множество
+    8-байтных хэшей уже встреченных пар. Оно растёт с числом уникальных пар
+    (около 75 байт на пару, то есть ~75 МБ на миллион пар).
+
+    Args:
+        file_path: Путь к CSV-файлу с данными (русский-алеутский).
+        max_length_ratio: Максимальное отношение длин более длинной и более короткой стороны пары.
+        max_chars: Максимальная длина каждой стороны пары в символах.
+        chunksize: Число строк CSV, читаемых за один раз.
+        stats: Словарь, в который записываются счётчики отброшенных пар (заполняется,
+            только если генератор действительно выполняется, а не взят из кэша datasets).
+        file_mtime: Время изменения файла; нужно только для того, чтобы кэш datasets
+            сбрасывался при изменении CSV-файла по тому же пути.
+
+    Yields:
+        dict: Пара в формате {"source": ..., "target": ...}.
+    """
+    stats = stats if stats is not None else {}
+    for key in ("read", "kept", "duplicates", "filtered"):
+        stats.setdefault(key, 0)
+    seen = set()
+
+    # Читаем файл частями, чтобы тексты корпуса не загружались в память целиком
+    for chunk in pd.read_csv(
+        file_path, sep=";", encoding="utf-8", usecols=["Russian", "Aleut"], chunksize=chunksize
+    ):
+        chunk = chunk.dropna()
+        for source, target in zip(chunk["Russian"].astype(str), chunk["Aleut"].astype(str)):
+            stats["read"] += 1
+            source = normalize_text(source)
+            target = normalize_text(target)
+
+            shorter, longer = sorted((len(source), len(target)))
+            if shorter == 0 or longer > max_chars or longer / shorter > max_length_ratio:
+                stats["filtered"] += 1
+                continue
+
+            digest = pair_digest(source, target)
+            if digest in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(digest)
+
+            stats["kept"] += 1
+            yield {"source": source, "target": target}
+
+
+def load_clean_pairs(file_path: str, stats: dict = None) -> Dataset:
+    """Записывает нормализованные уникальные пары CSV-файла в Arrow-датасет.
+
+    Повторный вызов для неизменённого файла берёт датасет из кэша datasets,
+    и тогда счётчики в stats не заполняются.
+    """
+    # from_generator пишет пары сразу в Arrow-файл, не накапливая их в списке
+    return Dataset.from_generator(
+        iter_clean_pairs,
+        gen_kwargs={
+            "file_path": file_path,
+            "stats": stats if stats is not None else {},
+            "file_mtime": os.path.getmtime(file_path),
+        },
+    )
+
+
+def split_pairs(dataset: Dataset, test_size: float = TEST_SIZE, seed: int = SPLIT_SEED) -> DatasetDict:
+    """Делит пары на train/test так же, как при подготовке датасета к обучению."""
+    return dataset.train_test_split(test_size=test_size, seed=seed)
+
+
+def tokenize_batch(examples: dict, tokenizer: MarianTokenizer, max_length: int = 128) -> dict:
+    """Токенизирует входные и целевые тексты пакета (как preprocess_function в ноутбуке)."""
+    model_inputs = tokenizer(
+        examples["source"],
+        max_length=max_length,
+        truncation=True,
+        padding="max_length",
+    )
+    with tokenizer.as_target_tokenizer():
+        labels = tokenizer(
+            examples["target"],
+            max_length=max_length,
+            truncation=True,
+            padding="max_length",
+        )
+    model_inputs["labels"] = labels["input_ids"]
+    return model_inputs
+
+
+def prepare_dataset(
+    file_path: str,
+    cache_dir: str,
+    model_name: str = "Helsinki-NLP/opus-mt-ru-en",
+    num_proc: int = None,
+    test_size: float = TEST_SIZE,
+    seed: int = SPLIT_SEED,
+) -> DatasetDict:
+    """Готовит токенизированный датасет и сохраняет его в кэш на диске.
+
+    Args:
+        file_path: Путь к CSV-файлу с данными.
+        cache_dir: Папка для сохранения подготовленного датасета.
+        model_name: Имя модели, токенизатор которой используется.
+        num_proc: Число процессов для токенизации (по умолчанию — число ядер).
+        test_size: Доля тестовой выборки.
+        seed: Зерно для воспроизводимого разбиения.
+
+    Returns:
+        DatasetDict: Выборки train/test, открытые из кэша.
+    """
+    started = time.perf_counter()
+    num_proc = num_proc or os.cpu_count() or 1
+
+    tokenizer = MarianTokenizer.from_pretrained(model_name)
+    tokenizer.add_tokens(["ẍ"])
+
+    stats = {}
+    dataset = load_clean_pairs(file_path, stats)
+    splits = split_pairs(dataset, test_size, seed)
+    splits = splits.map(
+        partial(tokenize_batch, tokenizer=tokenizer),
+        batched=True,
+        num_proc=min(num_proc, max(1, len(dataset) // 1000)),
+    )
+    splits.save_to_disk(cache_dir)
+
+    if stats.get("read"):
+        print(
+            f"Пар прочитано: {stats['read']}, оставлено: {len(dataset)}, "
+            f"дубликатов: {stats['duplicates']}, отфильтровано: {stats['filtered']}"
+        )
+    else:
+        # Генератор не выполнялся: пары взяты из кэша datasets, известно только их число
+        print(f"Пар оставлено: {len(dataset)} (очищенные пары взяты из кэша datasets)")
+    print(f"Предобработка заняла {time.perf_counter() - started:.1f} с, кэш: {cache_dir}")
+    return load_prepared_dataset(cache_dir)
+
+
+def load_prepared_dataset(cache_dir: str) -> DatasetDict:
+    """Открывает подготовленный датасет из кэша (с отображением файлов в память)."""
+    return load_from_disk(cache_dir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Предобработка датасета для обучения и оценки")
+    parser.add_argument("--dataset", required=True, help="Путь к CSV-файлу с парами переводов")
+    parser.add_argument("--cache-dir", default="dataset_cache", help="Папка для кэша Arrow")
+    parser.add_argument("--model", default="Helsinki-NLP/opus-mt-ru-en", help="Модель токенизатора")
+    parser.add_argument("--num-proc", type=int, default=None, help="Число процессов токенизации")
+    args = parser.parse_args()
+
+    prepare_dataset(args.dataset, args.cache_dir, args.model, args.num_proc)
+
+
+if __name__ == "__main__":
+    main()